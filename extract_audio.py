@@ -7,226 +7,585 @@ import os
 import sys
 import re
 import subprocess
+import json
 import logging
+import functools
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
+# Only the start of each video is transcribed: introductions happen early and
+# find_first_name() looks at the first 500 characters anyway
+TRANSCRIBE_SECONDS = 30
+
+# Whisper's input sample rate
+SAMPLE_RATE = 16000
+
+# Manifest (in the script directory) mapping video file name -> output MP3 name,
+# so re-runs can skip already-processed videos without transcribing them
+MANIFEST_NAME = ".names.json"
+
+# ffmpeg output options for the final MP3. Mono 22.05 kHz VBR is transparent
+# for speech and encodes faster and smaller than 128k CBR stereo at 44.1 kHz.
+MP3_ENCODE_ARGS = [
+    '-acodec', 'libmp3lame',  # MP3 codec
+    '-ac', '1',  # Mono
+    '-ar', '22050',  # Sample rate
+    '-q:a', '4',  # LAME VBR quality (0 = best, 9 = smallest)
+]
+
+# Number of final MP3s encoded together by one ffmpeg process
+ENCODE_BATCH_SIZE = 8
+
+# Whisper model size. "tiny" is plenty for spotting a name in a short intro;
+# set WHISPER_MODEL (e.g. "base", "small") to trade speed for accuracy.
+MODEL_SIZE = os.environ.get("WHISPER_MODEL", "tiny")
+
+# Compile the openai-whisper decoder with torch.compile. Off by default: the
+# one-off compile warmup only pays for itself on large batches.
+COMPILE_DECODER = os.environ.get("WHISPER_COMPILE", "0") == "1"
+
+if COMPILE_DECODER:
+    # Keep Inductor's compiled graphs in models/ so later runs reuse them
+    # instead of paying the full compile warmup again. Must be set before
+    # torch is imported.
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR",
+                          str(Path(__file__).parent / "models" / ".inductor_cache"))
+    os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+
+# Per-process state of each worker process
+_WORKER_LOGGER = None
+# CPU threads for Whisper inference in this process (0 = library default)
+_CPU_THREADS = 0
+# Device for Whisper in this process (None = the GPU if CUDA is available)
+_WHISPER_DEVICE = None
+# Loaded whisper models, keyed by (model_name, model_dir)
+_MODEL_CACHE = {}
+
 def check_ffmpeg():
     """Check if ffmpeg is installed."""
     try:
-        subprocess.run(['ffmpeg', '-version'], 
-                      capture_output=True, check=True)
+        subprocess.run(['ffmpeg', '-version'],
+                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
         return True
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
 
-def extract_audio_ffmpeg(video_path, output_path):
-    """Extract audio from video using ffmpeg."""
+def run_ffmpeg(cmd, capture_stdout=False):
+    """Run an ffmpeg command, raising RuntimeError with its error output if it fails.
+    
+    Returns ffmpeg's stdout if capture_stdout is set (for piped output).
+    Commands run with -loglevel error, so stderr only holds errors.
+    """
+    stdout = subprocess.PIPE if capture_stdout else subprocess.DEVNULL
+    result = subprocess.run(cmd, stdout=stdout, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with status {result.returncode}: "
+                           f"{result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
+def extract_audio(video_path, output_path):
+    """Extract a video's audio track to an MP3 file."""
     cmd = [
-        'ffmpeg',
-        '-i', video_path,
+        get_ffmpeg_exe(),
+        '-loglevel', 'error', '-nostats',  # Only report errors
+        '-i', str(video_path),
         '-vn',  # No video
-        '-acodec', 'libmp3lame',  # MP3 codec
-        '-ab', '128k',  # Audio bitrate (reduced for smaller file size)
-        '-ar', '44100',  # Sample rate
+        *MP3_ENCODE_ARGS,
         '-y',  # Overwrite output file
-        output_path
+        str(output_path)
+    ]
+    run_ffmpeg(cmd)
+
+def extract_audio_batch(video_paths, output_paths):
+    """Extract audio from several videos using a single ffmpeg process.
+    
+    Each input is mapped to its own MP3 output, so ffmpeg's startup cost is
+    paid once per batch instead of once per video.
+    """
+    cmd = [
+        get_ffmpeg_exe(),
+        '-loglevel', 'error', '-nostats',  # Only report errors
+        '-y',  # Overwrite output files
     ]
-    subprocess.run(cmd, check=True, capture_output=True)
+    for video_path in video_paths:
+        cmd += ['-i', str(video_path)]
+    for i, output_path in enumerate(output_paths):
+        cmd += [
+            '-map', f'{i}:a:0',  # First audio stream of input i
+            *MP3_ENCODE_ARGS,
+            str(output_path)
+        ]
+    run_ffmpeg(cmd)
 
-def extract_audio_imageio_ffmpeg(video_path, output_path):
-    """Extract audio from video using ffmpeg from imageio_ffmpeg."""
+@functools.lru_cache(maxsize=None)
+def get_ffmpeg_exe():
+    """Return the ffmpeg executable to use, preferring a system install."""
+    if check_ffmpeg():
+        return 'ffmpeg'
     try:
         import imageio_ffmpeg
-        ffmpeg_path = imageio_ffmpeg.get_ffmpeg_exe()
     except ImportError:
         print("Error: imageio_ffmpeg not found. Installing...")
         subprocess.run([sys.executable, '-m', 'pip', 'install', 'imageio-ffmpeg'], check=True)
         import imageio_ffmpeg
-        ffmpeg_path = imageio_ffmpeg.get_ffmpeg_exe()
+    return imageio_ffmpeg.get_ffmpeg_exe()
+
+def load_audio_for_transcription(video_path):
+    """Decode the first TRANSCRIBE_SECONDS of audio straight into a NumPy array.
     
-    # Use ffmpeg to extract audio
+    ffmpeg writes 16 kHz mono PCM (Whisper's native input) to a pipe, so
+    there is no temp file and no MP3 encode/decode round trip. Returns
+    float32 samples in [-1, 1].
+    """
+    import numpy as np
     cmd = [
-        ffmpeg_path,
+        get_ffmpeg_exe(),
+        '-loglevel', 'error', '-nostats',  # Only report errors
         '-i', str(video_path),
         '-vn',  # No video
-        '-acodec', 'libmp3lame',  # MP3 codec
-        '-ab', '128k',  # Audio bitrate (reduced for smaller file size)
-        '-ar', '44100',  # Sample rate
-        '-y',  # Overwrite output file
-        str(output_path)
+        '-t', str(TRANSCRIBE_SECONDS),  # Intro only
+        '-ac', '1',  # Mono
+        '-ar', str(SAMPLE_RATE),  # Whisper's sample rate
+        '-f', 's16le', '-acodec', 'pcm_s16le',  # Raw 16-bit PCM
+        '-'  # Write to stdout
     ]
-    subprocess.run(cmd, check=True, capture_output=True)
+    raw = run_ffmpeg(cmd, capture_stdout=True)
+    return np.frombuffer(raw, np.int16).astype(np.float32) / 32768.0
 
-def transcribe_audio(audio_path, model_dir=None):
-    """Transcribe audio using whisper."""
-    # Set up ffmpeg for whisper if available
-    temp_ffmpeg_dir = None
+@functools.lru_cache(maxsize=None)
+def cuda_available():
+    """Check if a CUDA GPU is usable by the installed whisper backend."""
     try:
-        import imageio_ffmpeg
-        ffmpeg_path = imageio_ffmpeg.get_ffmpeg_exe()
-        # Create a temporary directory and symlink ffmpeg there
-        import tempfile
-        temp_ffmpeg_dir = tempfile.mkdtemp()
-        # On Windows, preserve .exe extension; on Unix, use 'ffmpeg'
-        if sys.platform == 'win32':
-            ffmpeg_link = os.path.join(temp_ffmpeg_dir, 'ffmpeg.exe')
-            import shutil
-            shutil.copy(ffmpeg_path, ffmpeg_link)
-        else:
-            ffmpeg_link = os.path.join(temp_ffmpeg_dir, 'ffmpeg')
-            os.symlink(ffmpeg_path, ffmpeg_link)
-        # Add to PATH
-        os.environ['PATH'] = temp_ffmpeg_dir + os.pathsep + os.environ.get('PATH', '')
+        import ctranslate2  # Installed with faster-whisper
+        return ctranslate2.get_cuda_device_count() > 0
+    except ImportError:
+        pass
+    try:
+        import torch  # Installed with openai-whisper
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
+def compile_whisper_decoder(model):
+    """Wrap an openai-whisper model's decoder in torch.compile."""
+    try:
+        Path(os.environ["TORCHINDUCTOR_CACHE_DIR"]).mkdir(parents=True, exist_ok=True)
+        import torch
+        # Inductor fuses the decoder's per-token ops into fewer kernels. Shapes
+        # grow with the kv-cache every decoding step, hence dynamic=True (and
+        # no CUDA graphs, which would be re-recorded for every new shape).
+        model.decoder = torch.compile(model.decoder, dynamic=True)
     except Exception as e:
-        print(f"Warning: Could not set up ffmpeg for whisper: {e}")
+        print(f"Warning: Could not compile whisper decoder: {e}")
+    return model
+
+def import_whisper_backend():
+    """Import a transcription backend, returning (backend name, module).
     
+    Prefers faster-whisper; openai-whisper is only used when it is already
+    installed and faster-whisper is not. If neither is available,
+    faster-whisper is installed.
+    """
     try:
-        import whisper
-        # Use local model directory if provided
-        if model_dir:
-            model_dir.mkdir(exist_ok=True)
-            model = whisper.load_model("base", download_root=str(model_dir))
-        else:
-            model = whisper.load_model("base")
-        result = model.transcribe(audio_path)
-        # Clean up temp directory
-        if temp_ffmpeg_dir and os.path.exists(temp_ffmpeg_dir):
-            import shutil
-            shutil.rmtree(temp_ffmpeg_dir)
-        return result["text"]
+        import faster_whisper
+        return 'faster_whisper', faster_whisper
     except ImportError:
-        print("Error: whisper library not found. Installing...")
-        subprocess.run([sys.executable, '-m', 'pip', 'install', 'openai-whisper'], check=True)
+        pass
+    try:
         import whisper
-        # Use local model directory if provided
+        return 'whisper', whisper
+    except ImportError:
+        print("Error: whisper library not found. Installing faster-whisper...")
+        subprocess.run([sys.executable, '-m', 'pip', 'install', 'faster-whisper'], check=True)
+        import faster_whisper
+        return 'faster_whisper', faster_whisper
+
+def download_whisper_model(model_dir, model_name=MODEL_SIZE):
+    """Fetch a whisper model's files into model_dir without loading it.
+    
+    main calls this once before processing starts, so parallel workers find
+    the files in place instead of all downloading (and writing) them at once.
+    """
+    model_dir.mkdir(exist_ok=True)
+    backend, module = import_whisper_backend()
+    if backend == 'faster_whisper':
+        if not os.path.isdir(model_name):
+            module.download_model(model_name, cache_dir=str(model_dir))
+    elif model_name in module._MODELS:
+        # The download step of whisper.load_model; skips a file whose checksum matches
+        module._download(module._MODELS[model_name], str(model_dir), False)
+
+def _load_faster_whisper(module, model_name, model_dir, device):
+    """Build a faster-whisper model: FP16 on a CUDA GPU, int8 on CPU."""
+    compute_type = "float16" if device == "cuda" else "int8"
+    return module.WhisperModel(model_name, device=device, compute_type=compute_type,
+                               cpu_threads=_CPU_THREADS,
+                               download_root=str(model_dir) if model_dir else None)
+
+def load_whisper_model(model_name=MODEL_SIZE, model_dir=None, device=None):
+    """Load a whisper model, reusing it if this process has already loaded it.
+    
+    Uses faster-whisper (CTranslate2), or openai-whisper if only that is
+    installed (see import_whisper_backend).
+    Runs in FP16 on a CUDA GPU when one is available, otherwise on CPU
+    (int8 for faster-whisper); a faster-whisper model that cannot be built
+    on the GPU falls back to CPU. Pass device to force one, replacing a
+    cached model on another device. Returns a (backend, model, device) tuple.
+    """
+    key = (model_name, str(model_dir))
+    cached = _MODEL_CACHE.get(key)
+    if cached is not None and device in (None, cached[2]):
+        return cached
+    
+    # Use local model directory if provided
+    if model_dir:
+        model_dir.mkdir(exist_ok=True)
+    
+    if device is None:
+        device = _WHISPER_DEVICE or ("cuda" if cuda_available() else "cpu")
+    backend, module = import_whisper_backend()
+    if backend == 'faster_whisper':
+        try:
+            model = _load_faster_whisper(module, model_name, model_dir, device)
+        except Exception as e:
+            # e.g. a GPU without efficient FP16, or missing CUDA libraries
+            if device != "cuda":
+                raise
+            print(f"Warning: Could not load whisper model on the GPU, using CPU (int8) instead: {e}")
+            device = "cpu"
+            model = _load_faster_whisper(module, model_name, model_dir, device)
+        cached = ('faster_whisper', model, device)
+    else:
+        if _CPU_THREADS:
+            import torch
+            torch.set_num_threads(_CPU_THREADS)
         if model_dir:
-            model_dir.mkdir(exist_ok=True)
-            model = whisper.load_model("base", download_root=str(model_dir))
+            model = module.load_model(model_name, device=device, download_root=str(model_dir))
         else:
-            model = whisper.load_model("base")
-        result = model.transcribe(audio_path)
-        # Clean up temp directory
-        if temp_ffmpeg_dir and os.path.exists(temp_ffmpeg_dir):
-            import shutil
-            shutil.rmtree(temp_ffmpeg_dir)
-        return result["text"]
+            model = module.load_model(model_name, device=device)
+        if COMPILE_DECODER:
+            model = compile_whisper_decoder(model)
+        cached = ('whisper', model, device)
+    
+    _MODEL_CACHE[key] = cached
+    return cached
+
+def _transcribe_faster_whisper(model, audio):
+    """Transcribe audio with a faster-whisper model."""
+    # Greedy decoding (openai-whisper's default); the VAD filter skips silence
+    segments, _ = model.transcribe(audio, beam_size=1, vad_filter=True)
+    # Segments are generated lazily; joining them runs the transcription
+    return "".join(segment.text for segment in segments)
+
+def transcribe_audio(audio, model_dir=None):
+    """Transcribe audio (16 kHz float32 samples) using faster-whisper,
+    or openai-whisper if it is unavailable."""
+    backend, model, device = load_whisper_model(model_dir=model_dir)
+    if backend == 'faster_whisper':
+        try:
+            return _transcribe_faster_whisper(model, audio)
+        except Exception as e:
+            # Missing cuBLAS/cuDNN libraries only show up on the first transcribe
+            if device != "cuda":
+                raise
+            print(f"Warning: Transcription on the GPU failed, using CPU (int8) instead: {e}")
+            _, model, _ = load_whisper_model(model_dir=model_dir, device="cpu")
+            return _transcribe_faster_whisper(model, audio)
+    
+    # FP16 is only supported on GPU
+    fp16 = device == "cuda"
+    try:
+        result = model.transcribe(audio, fp16=fp16)
     except Exception as e:
-        # Clean up temp directory on error
-        if temp_ffmpeg_dir and os.path.exists(temp_ffmpeg_dir):
-            import shutil
-            shutil.rmtree(temp_ffmpeg_dir)
-        raise
+        # torch.compile is lazy, so compile errors only surface on the first
+        # call; switch back to the original (eager) decoder and retry
+        eager_decoder = getattr(model.decoder, "_orig_mod", None)
+        if eager_decoder is None:
+            raise
+        print(f"Warning: Compiled whisper decoder failed, using eager mode: {e}")
+        model.decoder = eager_decoder
+        result = model.transcribe(audio, fp16=fp16)
+    return result["text"]
+
+# Common words to skip when looking for names (expanded list)
+SKIP_WORDS = {
+    'The', 'This', 'That', 'There', 'Here', 'Hello', 'Hi', 'Hey', 'My', 'my', 'I', 'We', 'You',
+    'Everybody', 'Everyone', 'Anyone', 'Someone', 'Something', 'Somewhere', 'Today',
+    'Tomorrow', 'Yesterday', 'Now', 'Then', 'When', 'Where', 'What', 'Who', 'Why', 'How',
+    'Video', 'Intro', 'Introduction', 'About', 'Me', 'Just', 'just', 'And', 'Or', 'But',
+    'Senior', 'Junior', 'Sophomore', 'Freshman', 'Undergrad', 'Grad', 'Team', 'Year',
+    'Been', 'Have', 'Has', 'Had', 'Was', 'Were', 'Is', 'Are', 'Am', 'Be', 'Being',
+    'In', 'On', 'At', 'To', 'For', 'From', 'With', 'By', 'Of', 'As', 'An', 'A',
+    'First', 'Last', 'Next', 'Previous', 'Current', 'New', 'Old', 'Good', 'Bad',
+    'Little', 'Big', 'Many', 'Much', 'Some', 'Any', 'All', 'Each', 'Every', 'Both',
+    'College', 'University', 'School', 'Semester', 'Class', 'Course', 'Shop', 'Two',
+    'Raised', 'Born', 'From', 'Living', 'Working', 'Doing', 'Going', 'Getting'
+}
+
+# Case-insensitive skip words set
+SKIP_WORDS_LOWER = frozenset(w.lower() for w in SKIP_WORDS)
+
+# Priority patterns - these are most likely to contain a name.
+# Each entry is (compiled pattern, group holding the name), in priority order.
+_PRIORITY_PATTERNS = [
+    (re.compile(r"([A-Z][a-z]+)\s+here\b", re.IGNORECASE), 0),  # "[Name] here" pattern (most specific)
+    (re.compile(r"my\s+name\s+is\s+([A-Z][a-z]+)", re.IGNORECASE), 1),  # "my name is [Name]"
+    (re.compile(r"i\s+am\s+([A-Z][a-z]+)", re.IGNORECASE), 1),  # "I am [Name]"
+    (re.compile(r"i'm\s+([A-Z][a-z]+)", re.IGNORECASE), 1),  # "I'm [Name]"
+    (re.compile(r"this\s+is\s+([A-Z][a-z]+)", re.IGNORECASE), 1),  # "this is [Name]"
+]
+
+# Hyperscan database of _PRIORITY_PATTERNS (built on first use, False if unavailable)
+_HYPERSCAN_DB = None
+# ASCII separators that re's \s matches but hyperscan's does not
+_RE_ONLY_SPACE_RE = re.compile(r'[\x1c-\x1f]')
+
+# Characters stripped from candidate names
+_NON_WORD_RE = re.compile(r'[^\w]')
+
+class _NonWordStripTable(dict):
+    """str.translate table deleting every character re's [^\\w] matches.
+    
+    Entries are worked out (and cached) on first lookup, so every code
+    point is covered, including emoji and other characters beyond U+FFFF.
+    """
+    def __missing__(self, code_point):
+        entry = None if _NON_WORD_RE.match(chr(code_point)) else code_point
+        self[code_point] = entry
+        return entry
+
+_STRIP_NON_WORD = _NonWordStripTable()
+# Used to turn a detected name into a safe filename
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w\s-]')
+_SEPARATOR_RUN_RE = re.compile(r'[-\s]+')
+
+def _get_hyperscan_db():
+    """Compile _PRIORITY_PATTERNS into a single hyperscan database (once per process).
+    
+    Returns None if the optional hyperscan package is not installed.
+    """
+    global _HYPERSCAN_DB
+    if _HYPERSCAN_DB is None:
+        _HYPERSCAN_DB = False
+        try:
+            import hyperscan
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[pattern.pattern.encode() for pattern, _ in _PRIORITY_PATTERNS],
+                ids=list(range(len(_PRIORITY_PATTERNS))),
+                elements=len(_PRIORITY_PATTERNS),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(_PRIORITY_PATTERNS),
+            )
+            _HYPERSCAN_DB = db
+        except ImportError:
+            pass
+        except Exception as e:
+            print(f"Warning: Could not compile hyperscan patterns, using re: {e}")
+    return _HYPERSCAN_DB or None
+
+def _matching_pattern_ids(intro_text):
+    """Return the indices of the _PRIORITY_PATTERNS that occur in intro_text.
+    
+    With hyperscan this is one linear pass over the text for all patterns, so
+    only the patterns that matched need a re.search to pull out the name.
+    Hyperscan works on bytes, so non-ASCII text (where re's Unicode-aware
+    \\s and IGNORECASE behave differently) treats every pattern as a candidate,
+    as does text containing \\x1c-\\x1f, which only re's \\s matches.
+    """
+    db = _get_hyperscan_db()
+    if db is None or not intro_text.isascii() or _RE_ONLY_SPACE_RE.search(intro_text):
+        return range(len(_PRIORITY_PATTERNS))
+    
+    hits = set()
+    def on_match(pattern_id, start, end, flags, context):
+        hits.add(pattern_id)
+    db.scan(intro_text.encode('ascii'), match_event_handler=on_match)
+    return hits
 
 def find_first_name(text):
     """Find the first name mentioned in an introduction pattern."""
     # Focus on first 500 characters where introductions typically occur
     intro_text = text[:500] if len(text) > 500 else text
     
-    # Common words to skip (expanded list)
-    skip_words = {
-        'The', 'This', 'That', 'There', 'Here', 'Hello', 'Hi', 'Hey', 'My', 'my', 'I', 'We', 'You',
-        'Everybody', 'Everyone', 'Anyone', 'Someone', 'Something', 'Somewhere', 'Today',
-        'Tomorrow', 'Yesterday', 'Now', 'Then', 'When', 'Where', 'What', 'Who', 'Why', 'How',
-        'Video', 'Intro', 'Introduction', 'About', 'Me', 'Just', 'just', 'And', 'Or', 'But',
-        'Senior', 'Junior', 'Sophomore', 'Freshman', 'Undergrad', 'Grad', 'Team', 'Year',
-        'Been', 'Have', 'Has', 'Had', 'Was', 'Were', 'Is', 'Are', 'Am', 'Be', 'Being',
-        'In', 'On', 'At', 'To', 'For', 'From', 'With', 'By', 'Of', 'As', 'An', 'A',
-        'First', 'Last', 'Next', 'Previous', 'Current', 'New', 'Old', 'Good', 'Bad',
-        'Little', 'Big', 'Many', 'Much', 'Some', 'Any', 'All', 'Each', 'Every', 'Both',
-        'College', 'University', 'School', 'Semester', 'Class', 'Course', 'Shop', 'Two',
-        'Raised', 'Born', 'From', 'Living', 'Working', 'Doing', 'Going', 'Getting'
-    }
-    
-    # Create case-insensitive skip words set (once)
-    skip_words_lower = {w.lower() for w in skip_words}
-    
-    # Priority patterns - these are most likely to contain a name
-    # Search in intro_text only and return FIRST valid match
-    priority_patterns = [
-        (r"([A-Z][a-z]+)\s+here\b", 0),  # "[Name] here" pattern (most specific)
-        (r"my\s+name\s+is\s+([A-Z][a-z]+)", 1),  # "my name is [Name]"
-        (r"i\s+am\s+([A-Z][a-z]+)", 1),  # "I am [Name]"
-        (r"i'm\s+([A-Z][a-z]+)", 1),  # "I'm [Name]"
-        (r"this\s+is\s+([A-Z][a-z]+)", 1),  # "this is [Name]"
-    ]
-    
     # Try priority patterns first - return the FIRST valid match
-    for pattern, group_idx in priority_patterns:
-        match = re.search(pattern, intro_text, re.IGNORECASE)
+    candidates = _matching_pattern_ids(intro_text)
+    for pattern_id, (pattern, group_idx) in enumerate(_PRIORITY_PATTERNS):
+        if pattern_id not in candidates:
+            continue
+        match = pattern.search(intro_text)
         if match:
             name_part = match.group(group_idx) if match.groups() else match.group(0)
             if name_part:
                 # Extract the first name (first word)
                 name = name_part.split()[0]
                 # Clean the name
-                name = re.sub(r'[^\w]', '', name)
-                # Check against skip_words (case-insensitive)
-                if name and len(name) > 2 and name.lower() not in skip_words_lower:
+                name = name.translate(_STRIP_NON_WORD)
+                # Check against SKIP_WORDS (case-insensitive)
+                if name and len(name) > 2 and name.lower() not in SKIP_WORDS_LOWER:
                     # Additional validation: name should start with capital letter
                     if name[0].isupper():
                         return name
     
     # Last resort: look for capitalized words followed by another capitalized word in first 200 chars
-    words = intro_text[:200].split()
+    # Only the first 15 words (plus the word after the last one) are needed
+    words = intro_text[:200].split(None, 16)[:16]
     for i, word in enumerate(words[:15]):  # Check first 15 words only
-        clean_word = re.sub(r'[^\w]', '', word)
+        clean_word = word.translate(_STRIP_NON_WORD)
         if clean_word and clean_word[0].isupper() and len(clean_word) > 2:
-            if clean_word.lower() not in skip_words_lower:
+            if clean_word.lower() not in SKIP_WORDS_LOWER:
                 # Only return if followed by another capitalized word (likely a last name)
                 if i + 1 < len(words):
-                    next_word = re.sub(r'[^\w]', '', words[i + 1])
+                    next_word = words[i + 1].translate(_STRIP_NON_WORD)
                     if next_word and next_word[0].isupper() and len(next_word) > 2:
-                        if next_word.lower() not in skip_words_lower:
+                        if next_word.lower() not in SKIP_WORDS_LOWER:
                             # This looks like a full name, return first name
                             return clean_word
     
     return None
 
-def process_video(video_path, logger, model_dir=None):
-    """Process a single video file and extract audio with name-based naming."""
+def temp_mp3_path(video_path):
+    """Return the temporary MP3 a video's audio is encoded to before renaming.
+    
+    Named after the full file name, so v.mp4 and v.MP4 don't collide.
+    """
+    return video_path.parent / f"temp_audio_{video_path.name}.mp3"
+
+def rename_temp_mp3(video_path, temp_mp3, final_mp3, logger):
+    """Move an encoded temp MP3 to its final name, returning True on success."""
+    try:
+        temp_mp3.rename(final_mp3)
+    except OSError as e:
+        logger.error(f"{video_path.name}: Could not rename {temp_mp3.name} to {final_mp3.name}: {e}")
+        return False
+    return True
+
+def encode_final_mp3(video_path, final_mp3, logger):
+    """Encode the full-length MP3 once its final name is known.
+    
+    Encodes to a temporary file first so an interrupted run never leaves a
+    partial file under the final name. Runs on main's encoder thread, so it
+    reports through the logger only (its handlers keep lines whole).
+    """
+    # Create temporary MP3 file (unique per video)
+    temp_mp3 = temp_mp3_path(video_path)
+    
+    logger.info(f"Encoding full audio from {video_path.name}")
+    try:
+        extract_audio(video_path, temp_mp3)
+    except Exception as e:
+        logger.error(f"{video_path.name}: Error extracting audio: {e}")
+        if temp_mp3.exists():
+            temp_mp3.unlink()
+        return False
+    
+    # Rename temp file
+    return rename_temp_mp3(video_path, temp_mp3, final_mp3, logger)
+
+def encode_final_mp3s(jobs, logger):
+    """Encode the full-length MP3s for a batch of (video_path, final_mp3) jobs.
+    
+    The whole batch goes through one ffmpeg process. If that fails (e.g. one
+    corrupt video), each job is retried on its own so only the broken video
+    fails. Returns the jobs whose MP3 was created. Like encode_final_mp3,
+    reports through the logger only.
+    """
+    if len(jobs) == 1:
+        return jobs if encode_final_mp3(*jobs[0], logger) else []
+    
+    temp_mp3s = [temp_mp3_path(video_path) for video_path, _ in jobs]
+    
+    logger.info(f"Encoding full audio for {len(jobs)} video(s): "
+                f"{', '.join(video_path.name for video_path, _ in jobs)}")
+    try:
+        extract_audio_batch([video_path for video_path, _ in jobs], temp_mp3s)
+    except Exception as e:
+        logger.warning(f"Batch encode failed, encoding files one at a time: {e}")
+        for temp_mp3 in temp_mp3s:
+            if temp_mp3.exists():
+                temp_mp3.unlink()
+        return [job for job in jobs if encode_final_mp3(*job, logger)]
+    
+    # Rename temp files
+    return [job for job, temp_mp3 in zip(jobs, temp_mp3s)
+            if rename_temp_mp3(job[0], temp_mp3, job[1], logger)]
+
+def init_worker(log_file, cpu_threads, device=None):
+    """Set up a worker process once, when the pool starts it.
+    
+    Attaches the worker's logger to the run's shared log file (loggers
+    cannot be pickled and sent along with each video), and limits Whisper
+    to cpu_threads so the workers together don't oversubscribe the CPU.
+    device, if given, is the device main found the model actually runs on.
+    """
+    global _WORKER_LOGGER, _CPU_THREADS, _WHISPER_DEVICE
+    _WORKER_LOGGER, _ = setup_logging(log_file.parent, log_file=log_file)
+    _CPU_THREADS = cpu_threads
+    _WHISPER_DEVICE = device
+
+def log_video_header(video_path, logger):
+    """Announce that a video is being processed."""
     logger.info(f"Processing: {video_path.name}")
     print(f"\n{'='*60}")
     print(f"Processing: {video_path.name}")
     print(f"{'='*60}")
+
+def check_known_output(video_path, known_name, logger):
+    """Return a skip result if a previous run already created this video's MP3, else None.
     
-    # Create temporary MP3 file (unique per video)
-    temp_mp3 = video_path.parent / f"temp_audio_{video_path.stem}.mp3"
+    known_name is the output name recorded in the manifest, if any.
+    """
+    if known_name:
+        known_mp3 = video_path.parent / f"{known_name}.mp3"
+        if known_mp3.exists():
+            msg = f"Skipping: {known_mp3.name} already exists (from {MANIFEST_NAME})"
+            print(f"[SKIP] {msg}")
+            logger.info(f"{video_path.name}: {msg}")
+            return True, known_name, False
+    return None
+
+def extract_intro_audio(video_path, logger, prefetched=None):
+    """Load a video's intro audio for transcription, or return None if that fails.
     
-    print("Extracting audio from video...")
-    logger.info(f"Extracting audio from {video_path.name}")
+    prefetched is an (audio, error) pair if the audio was already loaded in
+    the background (see process_videos_pipelined); it is reported here.
+    """
+    print(f"Extracting audio for transcription from {video_path.name}...")
+    logger.info(f"Extracting first {TRANSCRIBE_SECONDS}s of audio from {video_path.name}")
     try:
-        if check_ffmpeg():
-            extract_audio_ffmpeg(str(video_path), str(temp_mp3))
-        else:
-            print("ffmpeg not found, using imageio_ffmpeg instead...")
-            logger.info("Using imageio_ffmpeg for audio extraction")
-            extract_audio_imageio_ffmpeg(str(video_path), str(temp_mp3))
-        print(f"Audio extracted to: {temp_mp3}")
-        logger.info(f"Audio extracted successfully to {temp_mp3.name}")
+        if prefetched is None:
+            return load_audio_for_transcription(video_path)
+        audio, error = prefetched
+        if error is not None:
+            raise error
+        return audio
     except Exception as e:
         error_msg = f"Error extracting audio: {e}"
         print(error_msg)
         logger.error(f"{video_path.name}: {error_msg}")
-        if temp_mp3.exists():
-            temp_mp3.unlink()
-        return False
+        return None
+
+def detect_output_name(video_path, audio, logger, model_dir=None):
+    """Transcribe a video's intro audio and pick its name-based output MP3.
     
+    The full-length MP3 is not encoded here: the caller batches those (see
+    encode_final_mp3s). Returns a (success, output_name, needs_encode) tuple.
+    """
     # Transcribe audio
     print("Transcribing audio to find name...")
     logger.info(f"Transcribing audio for {video_path.name}")
     try:
-        transcription = transcribe_audio(str(temp_mp3), model_dir=model_dir)
+        transcription = transcribe_audio(audio, model_dir=model_dir)
         print(f"\nTranscription (first 500 chars):\n{transcription[:500]}...\n")
         logger.debug(f"Transcription preview: {transcription[:500]}")
     except Exception as e:
         error_msg = f"Error transcribing audio: {e}"
         print(error_msg)
         logger.error(f"{video_path.name}: {error_msg}")
-        # Clean up temp file
-        if temp_mp3.exists():
-            temp_mp3.unlink()
-        return False
+        return False, None, False
     
     # Find name (only first name)
     name = find_first_name(transcription)
@@ -235,8 +594,8 @@ def process_video(video_path, logger, model_dir=None):
         # Ensure we only use the first name (split and take first word)
         name = name.split()[0] if name else name
         # Clean name for filename (remove invalid characters)
-        safe_name = re.sub(r'[^\w\s-]', '', name).strip()
-        safe_name = re.sub(r'[-\s]+', '-', safe_name)
+        safe_name = _UNSAFE_FILENAME_RE.sub('', name).strip()
+        safe_name = _SEPARATOR_RUN_RE.sub('-', safe_name)
         final_mp3 = video_path.parent / f"{safe_name}.mp3"
         
         # Check if MP3 already exists
@@ -244,16 +603,11 @@ def process_video(video_path, logger, model_dir=None):
             msg = f"Skipping: {final_mp3.name} already exists"
             print(f"[SKIP] {msg}")
             logger.info(f"{video_path.name}: {msg}")
-            # Clean up temp file
-            if temp_mp3.exists():
-                temp_mp3.unlink()
-            return True
+            return True, final_mp3.stem, False
         
-        # Rename temp file
-        temp_mp3.rename(final_mp3)
-        success_msg = f"Success! Created: {final_mp3.name} (Name found: {name})"
-        print(f"[OK] {success_msg}")
-        logger.info(f"{video_path.name}: {success_msg}")
+        msg = f"Name found: {name}"
+        print(msg)
+        logger.info(f"{video_path.name}: {msg}")
     else:
         # Use default name if no name found
         final_mp3 = video_path.parent / "audio.mp3"
@@ -263,21 +617,178 @@ def process_video(video_path, logger, model_dir=None):
             msg = f"Skipping: {final_mp3.name} already exists"
             print(f"[SKIP] {msg}")
             logger.info(f"{video_path.name}: {msg}")
-            # Clean up temp file
-            if temp_mp3.exists():
-                temp_mp3.unlink()
-            return True
+            return True, final_mp3.stem, False
         
-        temp_mp3.rename(final_mp3)
-        warning_msg = f"Could not find a name in the transcription. Created: {final_mp3.name}"
+        warning_msg = f"Could not find a name in the transcription. Using: {final_mp3.name}"
         print(f"[WARN] {warning_msg}")
         logger.warning(f"{video_path.name}: {warning_msg}")
     
-    return True
+    return True, final_mp3.stem, True
 
-def setup_logging(log_dir):
-    """Set up logging to both file and console."""
-    log_file = log_dir / f"extract_audio_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+def process_video(video_path, model_dir=None, known_name=None):
+    """Work out the name-based output MP3 for a single video file.
+    
+    Runs inside a worker process set up by init_worker. known_name is the
+    output name recorded in the manifest by a previous run, if any.
+    Returns a (success, output_name, needs_encode) tuple.
+    """
+    logger = _WORKER_LOGGER
+    log_video_header(video_path, logger)
+    
+    # Already processed on a previous run: skip extraction and transcription
+    skip_result = check_known_output(video_path, known_name, logger)
+    if skip_result:
+        return skip_result
+    
+    audio = extract_intro_audio(video_path, logger)
+    if audio is None:
+        return False, None, False
+    return detect_output_name(video_path, audio, logger, model_dir=model_dir)
+
+def process_videos_in_pool(jobs, log_file, logger, model_dir, max_workers, mp_context=None,
+                           device=None):
+    """Process (video_path, known_name) jobs across worker processes.
+    
+    Yields (video_path, result) pairs as videos finish, where result is
+    process_video's return value.
+    """
+    cpu_threads = max(1, (os.cpu_count() or 1) // max_workers)
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context,
+                             initializer=init_worker, initargs=(log_file, cpu_threads, device)) as executor:
+        futures = {
+            executor.submit(process_video, video_path, model_dir, known_name): video_path
+            for video_path, known_name in jobs
+        }
+        for future in as_completed(futures):
+            video_path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                error_msg = f"Error processing {video_path.name}: {e}"
+                print(error_msg)
+                logger.error(error_msg, exc_info=True)
+                result = False, None, False
+            yield video_path, result
+
+def _extract_ahead(jobs, audio_queue):
+    """Producer thread for process_videos_pipelined: load each job's intro audio in order.
+    
+    Queues (video_path, known_name, prefetched) items, followed by None once
+    every job is done. prefetched is an (audio, error) pair, or None for
+    jobs whose MP3 already exists. Prints and logs nothing: the consumer
+    reports every item, so output stays in order and under the right video.
+    """
+    try:
+        for video_path, known_name in jobs:
+            prefetched = None
+            if not (known_name and (video_path.parent / f"{known_name}.mp3").exists()):
+                try:
+                    prefetched = load_audio_for_transcription(video_path), None
+                except Exception as e:
+                    prefetched = None, e
+            audio_queue.put((video_path, known_name, prefetched))
+    finally:
+        audio_queue.put(None)
+
+def process_videos_pipelined(jobs, logger, model_dir=None):
+    """Process (video_path, known_name) jobs in this process, one at a time.
+    
+    A producer thread extracts the next videos' audio while this thread
+    transcribes the current one. ffmpeg runs as a subprocess, so the two
+    really overlap. Yields (video_path, result) pairs in order.
+    """
+    # Small bound: only stay a video or two ahead of transcription
+    audio_queue = queue.Queue(maxsize=2)
+    producer = threading.Thread(target=_extract_ahead, args=(jobs, audio_queue), daemon=True)
+    producer.start()
+    
+    while True:
+        item = audio_queue.get()
+        if item is None:
+            break
+        video_path, known_name, prefetched = item
+        log_video_header(video_path, logger)
+        try:
+            result = check_known_output(video_path, known_name, logger)
+            if result is None:
+                audio = extract_intro_audio(video_path, logger, prefetched)
+                if audio is None:
+                    result = False, None, False
+                else:
+                    result = detect_output_name(video_path, audio, logger, model_dir=model_dir)
+        except Exception as e:
+            error_msg = f"Error processing {video_path.name}: {e}"
+            print(error_msg)
+            logger.error(error_msg, exc_info=True)
+            result = False, None, False
+        yield video_path, result
+
+def load_name_manifest(manifest_path):
+    """Load the video file name -> output name manifest written by previous runs."""
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read {manifest_path.name}, ignoring it: {e}")
+        return {}
+    if not isinstance(manifest, dict):
+        print(f"Warning: Could not read {manifest_path.name}, ignoring it: not a JSON object")
+        return {}
+    return manifest
+
+def save_name_manifest(manifest_path, manifest):
+    """Write the manifest atomically (temp file + rename) so it is never left half-written."""
+    # Only main writes the manifest, so a fixed temp name is safe
+    temp_path = manifest_path.with_name(manifest_path.name + '.tmp')
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(temp_path, manifest_path)
+    except Exception:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
+
+def record_output_name(manifest, manifest_path, video_name, output_name, logger):
+    """Record a video's output name in the manifest and flush it to disk."""
+    if manifest.get(video_name) == output_name:
+        return
+    manifest[video_name] = output_name
+    try:
+        save_name_manifest(manifest_path, manifest)
+    except OSError as e:
+        logger.warning(f"Could not update {MANIFEST_NAME}: {e}")
+
+def collect_encodes(encodes, manifest, manifest_path, logger, wait=False):
+    """Record the results of finished background encodes.
+    
+    encodes is a list of (future, batch) pairs in submission order; finished
+    ones are removed from it. With wait set, blocks until all have finished.
+    Returns (created, failed) counts.
+    """
+    created_count = failed_count = 0
+    # A single encoder thread finishes batches in order
+    while encodes and (wait or encodes[0][0].done()):
+        future, batch = encodes.pop(0)
+        created = future.result()
+        for video_path, final_mp3 in created:
+            success_msg = f"Success! Created: {final_mp3.name}"
+            print(f"[OK] {success_msg}")
+            logger.info(f"{video_path.name}: {success_msg}")
+            record_output_name(manifest, manifest_path, video_path.name, final_mp3.stem, logger)
+        created_count += len(created)
+        failed_count += len(batch) - len(created)
+    return created_count, failed_count
+
+def setup_logging(log_dir, log_file=None):
+    """Set up logging to both file and console.
+    
+    Pass log_file to append to an existing run's log (used by worker processes).
+    """
+    if log_file is None:
+        log_file = log_dir / f"extract_audio_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
     
     # Create logger
     logger = logging.getLogger('extract_audio')
@@ -319,8 +830,14 @@ def main():
     logger.info(f"Log file: {log_file.name}")
     logger.info("="*60)
     
-    # Find all MP4 video files in the directory
-    video_files = list(script_dir.glob("*.mp4"))
+    # Find all MP4 video files in the directory (any case of the extension).
+    # scandir entries carry their file type, so no extra stat per file.
+    with os.scandir(script_dir) as entries:
+        video_files = sorted(
+            (Path(entry.path) for entry in entries
+             if entry.name.lower().endswith('.mp4') and entry.is_file()),
+            key=lambda path: path.name
+        )
     
     if not video_files:
         msg = "No MP4 video files found in the directory."
@@ -331,23 +848,96 @@ def main():
     print(f"Found {len(video_files)} video file(s) to process.\n")
     logger.info(f"Found {len(video_files)} video file(s) to process")
     
-    # Process each video file
+    # Install a Whisper backend up front if needed: it also brings in NumPy,
+    # which audio extraction needs before the model is first loaded. Then
+    # fetch the model once, before any worker tries to load it.
+    import_whisper_backend()
+    download_whisper_model(models_dir)
+    
+    manifest_path = script_dir / MANIFEST_NAME
+    manifest = load_name_manifest(manifest_path)
+    
+    jobs = [(video_path, manifest.get(video_path.name)) for video_path in video_files]
+    
+    max_workers = min(len(video_files), os.cpu_count() or 1)
+    model_loaded = False
+    worker_device = None
+    if cuda_available():
+        # Load the model here to see whether it really runs on the GPU (it
+        # falls back to CPU if it can't)
+        _, _, device = load_whisper_model(model_dir=models_dir)
+        model_loaded = True
+        if device == "cuda":
+            # One process keeps the GPU busy; more would each load a model
+            # into GPU memory
+            max_workers = 1
+            logger.info("CUDA GPU found: transcribing on GPU with FP16")
+        else:
+            logger.info("CUDA GPU found but unusable: transcribing on CPU")
+            # Workers load their own model on CPU, with their share of the
+            # CPU threads
+            _MODEL_CACHE.clear()
+            worker_device = "cpu"
+    
+    if max_workers > 1:
+        # Process videos in parallel: ffmpeg extraction and Whisper inference
+        # are independent per file, so each worker handles one video at a time
+        # Windows has no fork(); elsewhere, don't fork a process that has
+        # already loaded a model. Be explicit so workers re-import cleanly.
+        use_spawn = sys.platform == 'win32' or model_loaded
+        mp_context = multiprocessing.get_context('spawn') if use_spawn else None
+        logger.info(f"Using {max_workers} worker processes")
+        results = process_videos_in_pool(jobs, log_file, logger, models_dir, max_workers, mp_context,
+                                         device=worker_device)
+    else:
+        # Single process: hide extraction time behind transcription instead
+        logger.info("Using a single process, extracting audio ahead of transcription")
+        results = process_videos_pipelined(jobs, logger, model_dir=models_dir)
+    
     successful = 0
     skipped = 0
     failed = 0
     
-    for video_path in sorted(video_files):
-        try:
-            result = process_video(video_path, logger, model_dir=models_dir)
-            if result:
-                successful += 1
-            else:
+    # Final MP3s are encoded in batches on a background thread, so ffmpeg
+    # runs while the next videos are being transcribed. Results are recorded
+    # here on the main thread, which owns the manifest.
+    pending = []
+    queued = set()
+    encodes = []
+    
+    with ThreadPoolExecutor(max_workers=1) as encoder:
+        for video_path, (result, output_name, needs_encode) in results:
+            created, encode_failed = collect_encodes(encodes, manifest, manifest_path, logger)
+            successful += created
+            failed += encode_failed
+            
+            if not result:
                 failed += 1
-        except Exception as e:
-            error_msg = f"Error processing {video_path.name}: {e}"
-            print(error_msg)
-            logger.error(error_msg, exc_info=True)
-            failed += 1
+                continue
+            
+            final_mp3 = video_path.parent / f"{output_name}.mp3"
+            # Another video in this run already claimed the same name
+            if needs_encode and final_mp3 in queued:
+                msg = f"Skipping: {final_mp3.name} is already being created for another video"
+                print(f"[SKIP] {msg}")
+                logger.info(f"{video_path.name}: {msg}")
+                needs_encode = False
+            if not needs_encode:
+                successful += 1
+                record_output_name(manifest, manifest_path, video_path.name, output_name, logger)
+                continue
+            
+            queued.add(final_mp3)
+            pending.append((video_path, final_mp3))
+            if len(pending) >= ENCODE_BATCH_SIZE:
+                encodes.append((encoder.submit(encode_final_mp3s, pending, logger), pending))
+                pending = []
+        
+        if pending:
+            encodes.append((encoder.submit(encode_final_mp3s, pending, logger), pending))
+        created, encode_failed = collect_encodes(encodes, manifest, manifest_path, logger, wait=True)
+        successful += created
+        failed += encode_failed
     
     # Summary
     summary = f"Processing complete! Successful: {successful}, Failed: {failed}"